@@ -1,192 +1,515 @@
-import os
-import sys
-import json
-import google.generativeai as genai
-from flask import Flask, request, jsonify, Response
-from flask_cors import CORS
-from dotenv import load_dotenv
-load_dotenv()
-
-# --- 1. Initial Configuration and Setup ---
-
-# Load the API Key securely from an environment variable
-api_key = os.getenv("GOOGLE_API_KEY")
-
-if not api_key:
-    print("Error: GOOGLE_API_KEY environment variable not set.", file=sys.stderr)
-    sys.exit(1)
-
-genai.configure(api_key=api_key)
-
-# --- Configuration ---
-MODEL_ID = "gemini-2.5-flash"  # Flash model is great for fast chat/Q&A
-JSON_DATA_DIR = "json" # Directory where analysis files are stored
-
-# --- 2. Initialize Flask App and Gemini Model ---
-
-app = Flask(__name__)
-
-# Enable CORS for all routes, allowing requests from any origin.
-CORS(app, resources={
-    r"/*": {
-        "origins": "*",
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With"]
-    }
-})
-
-try:
-    model = genai.GenerativeModel(MODEL_ID)
-    print(f"✅ Gemini model '{MODEL_ID}' initialized successfully.")
-except Exception as e:
-    print(f"❌ FATAL ERROR: Could not initialize Gemini model. Reason: {e}", file=sys.stderr)
-    sys.exit(1)
-
-# --- 3. Helper Functions ---
-
-def load_video_context(filename: str) -> str:
-    """
-    Loads and returns the video context from a specified JSON file.
-    Performs security checks to prevent directory traversal.
-    """
-    # Security check: ensure filename is just a name, not a path
-    if os.path.basename(filename) != filename:
-        raise ValueError("Invalid filename provided. Directory traversal is not permitted.")
-        
-    filepath = os.path.join(JSON_DATA_DIR, filename)
-    
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            video_data = json.load(f)
-        # Convert the loaded JSON data into a formatted string for the prompt
-        return json.dumps(video_data, indent=2)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"The requested analysis file '{filename}' was not found.")
-    except json.JSONDecodeError:
-        raise json.JSONDecodeError(f"The file '{filename}' contains invalid JSON.", "", 0)
-
-
-def create_prompt(question: str, video_context_string: str) -> str:
-    """Creates a concise prompt for the Gemini model."""
-    return f"""
-    Answer the user's question using ONLY the provided JSON video context.
-    If the answer isn't in the context, state "I don't have information on that."
-    **CRITICAL:** Cite the exact MM:SS timestamp from the JSON for any event or dialogue mentioned.
-
-    --- Context (JSON) ---
-    {video_context_string}
-    --- End of Context ---
-
-    Question: "{question}"
-    """
-
-def handle_preflight():
-    """Centralized handler for OPTIONS preflight requests."""
-    response = Response()
-    response.headers.add("Access-Control-Allow-Origin", "*")
-    response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
-    response.headers.add("Access-Control-Allow-Methods", "GET,POST,OPTIONS")
-    return response
-
-# --- 4. API Endpoints ---
-
-@app.route("/videos", methods=["GET", "OPTIONS"])
-def list_videos():
-    """
-    Scans the JSON directory and returns a list of available video analysis files.
-    """
-    if request.method == "OPTIONS":
-        return handle_preflight()
-        
-    if not os.path.isdir(JSON_DATA_DIR):
-        return jsonify({"error": f"Server configuration error: Directory '{JSON_DATA_DIR}' not found."}), 500
-        
-    try:
-        video_files = [f for f in os.listdir(JSON_DATA_DIR) if f.endswith('.json')]
-        return jsonify(video_files)
-    except Exception as e:
-        return jsonify({"error": f"An unexpected error occurred while listing videos: {e}"}), 500
-
-@app.route("/ask", methods=["POST", "OPTIONS"])
-def ask_question():
-    """
-    Standard non-streaming endpoint. Accepts a question and a video_file.
-    """
-    if request.method == "OPTIONS":
-        return handle_preflight()
-    
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "Invalid request. Expecting JSON body."}), 400
-        
-    question = data.get('question')
-    video_file = data.get('video_file')
-
-    if not all([question, video_file]):
-        return jsonify({"error": "Both 'question' and 'video_file' must be provided."}), 400
-    
-    try:
-        video_context = load_video_context(video_file)
-        prompt = create_prompt(question, video_context)
-        response = model.generate_content(prompt)
-        return jsonify({"answer": response.text})
-    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
-        return jsonify({"error": str(e)}), 404 # 404 for file not found or invalid
-    except Exception as e:
-        print(f"ERROR in /ask: {e}", file=sys.stderr)
-        return jsonify({"error": f"An internal server error occurred: {e}"}), 500
-
-@app.route("/ask-streaming", methods=["POST", "OPTIONS"])
-def ask_question_streaming():
-    """
-    Streaming endpoint. Returns the response as a real-time stream.
-    Accepts a question and a video_file.
-    """
-    if request.method == "OPTIONS":
-        return handle_preflight()
-    
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "Invalid request. Expecting JSON body."}), 400
-
-    question = data.get('question')
-    video_file = data.get('video_file')
-
-    if not all([question, video_file]):
-        # Cannot return JSON for a stream, but this error happens before the stream starts.
-        return jsonify({"error": "Both 'question' and 'video_file' must be provided."}), 400
-
-    try:
-        # Load context before starting the stream to catch file errors early.
-        video_context = load_video_context(video_file)
-        prompt = create_prompt(question, video_context)
-    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
-        return jsonify({"error": str(e)}), 404
-
-    def stream_gemini_response():
-        """A generator function that yields chunks from the Gemini stream."""
-        try:
-            response_stream = model.generate_content(prompt, stream=True)
-            for chunk in response_stream:
-                if chunk.text: # Ensure there's text to send
-                    yield chunk.text
-        except Exception as e:
-            print(f"Error during streaming: {e}", file=sys.stderr)
-            yield f"\nAn error occurred during streaming: {e}"
-
-    # Return a Flask Response object that streams the generator's output.
-    response = Response(stream_gemini_response(), mimetype='text/plain')
-    response.headers.add("Access-Control-Allow-Origin", "*") # Redundant with CORS lib, but safe
-    return response
-
-@app.route("/", methods=["GET", "OPTIONS"])
-def read_root():
-    """Root endpoint to confirm the API is running."""
-    if request.method == "OPTIONS":
-        return handle_preflight()
-    
-    return jsonify({"status": "Video Chat API is running. Use the /videos, /ask or /ask-streaming endpoints."})
-
-# This allows running the app directly with `python app.py` for development
-if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+import os
+import re
+import sys
+import json
+import gzip
+import time
+import mmap
+import asyncio
+import functools
+import ijson
+import orjson
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.middleware.cors import CORSMiddleware
+from dotenv import load_dotenv
+load_dotenv()
+
+# --- 1. Initial Configuration and Setup ---
+
+# Load the API Key securely from an environment variable
+api_key = os.getenv("GOOGLE_API_KEY")
+
+if not api_key:
+    print("Error: GOOGLE_API_KEY environment variable not set.", file=sys.stderr)
+    sys.exit(1)
+
+# Explicit async gRPC transport: one channel, created once, reused by every
+# request for the life of the process.
+genai.configure(api_key=api_key, transport="grpc_asyncio")
+
+# --- Configuration ---
+MODEL_ID = "gemini-2.5-flash"  # Flash model is great for fast chat/Q&A
+JSON_DATA_DIR = "json" # Directory where analysis files are stored
+
+# --- 2. Initialize FastAPI App and Gemini Model ---
+
+app = FastAPI()
+
+# Enable CORS for all routes, allowing requests from any origin.
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With"],
+)
+
+try:
+    model = genai.GenerativeModel(MODEL_ID)
+    print(f"✅ Gemini model '{MODEL_ID}' initialized successfully.")
+except Exception as e:
+    print(f"❌ FATAL ERROR: Could not initialize Gemini model. Reason: {e}", file=sys.stderr)
+    sys.exit(1)
+
+# --- 3. Helper Functions ---
+
+# Files at or above this size are validated incrementally with ijson instead
+# of a whole-tree orjson parse, so validation memory stays flat.
+LARGE_CTX_BYTES = 8 * 1024 * 1024
+
+
+def _load_large(filepath: str, filename: str) -> str:
+    """
+    Validates a large context file with ijson's incremental parser (constant
+    memory, no materialized tree) and reads the bytes back through a memory
+    map so the only userspace copy is the decoded string itself.
+    """
+    with open(filepath, 'rb') as f:
+        try:
+            for _ in ijson.parse(f):
+                pass
+        except ijson.JSONError:
+            raise json.JSONDecodeError(f"The file '{filename}' contains invalid JSON.", "", 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:].decode('utf-8')
+
+
+@functools.lru_cache(maxsize=64)
+def _load_cached(filename: str, mtime_ns: int) -> str:
+    """
+    Reads a context file. Cached on (filename, mtime_ns) so the read and
+    validation happen once per file version; a changed file gets a new mtime
+    and therefore a fresh cache entry.
+    """
+    filepath = os.path.join(JSON_DATA_DIR, filename)
+    if filename.endswith('.gz'):
+        # Compressed at rest: gunzip decodes at a few hundred MB/s, far
+        # faster than parsing, and the LRU means it happens once per version.
+        with gzip.open(filepath, 'rb') as f:
+            raw = f.read()
+    elif os.path.getsize(filepath) >= LARGE_CTX_BYTES:
+        return _load_large(filepath, filename)
+    else:
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+    try:
+        # Validate only -- the model doesn't need canonical formatting, so the
+        # raw text is passed through as-is instead of a parse/re-serialize
+        # round-trip (which triples peak memory on large files).
+        orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        raise json.JSONDecodeError(f"The file '{filename}' contains invalid JSON.", "", 0)
+    return raw.decode('utf-8')
+
+
+def _resolve_context(filename: str) -> tuple:
+    """
+    Validates a context filename and resolves it to what is actually on disk,
+    falling back transparently to a gzip-compressed sibling ('X.json' ->
+    'X.json.gz'). Performs security checks to prevent directory traversal.
+    Returns (resolved_name, mtime_ns); the mtime is the cache key for
+    everything derived from the file's content.
+    """
+    # Security check: ensure filename is just a name, not a path.
+    # Kept outside the caches so a crafted path can never poison an entry.
+    if os.path.basename(filename) != filename:
+        raise ValueError("Invalid filename provided. Directory traversal is not permitted.")
+
+    filepath = os.path.join(JSON_DATA_DIR, filename)
+
+    try:
+        return filename, os.stat(filepath).st_mtime_ns
+    except FileNotFoundError:
+        if not filename.endswith('.gz'):
+            try:
+                return filename + '.gz', os.stat(filepath + '.gz').st_mtime_ns
+            except FileNotFoundError:
+                pass
+        raise FileNotFoundError(f"The requested analysis file '{filename}' was not found.")
+
+
+def load_video_context(filename: str) -> str:
+    """
+    Loads and returns the video context from a specified JSON file.
+    Results are cached per file version, so repeated questions about the
+    same video cost a stat call plus a dict lookup.
+    """
+    return _load_cached(*_resolve_context(filename))
+
+
+# Contexts larger than this are filtered down to question-relevant entries
+# before being sent to the model: prompt tokens (and so time-to-first-token
+# and cost) grow linearly with context size.
+MAX_CTX_BYTES = 200_000
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _shrink_context(video_context_string: str, question: str) -> str:
+    """
+    Reduces an oversized context to the entries that share a keyword with the
+    question. The analysis files are dicts of lists (audio_transcription,
+    visual_events, ...), so each list is filtered entry-by-entry; anything
+    that isn't that shape is kept as-is.
+    """
+    keywords = set(_WORD_RE.findall(question.lower()))
+    try:
+        data = orjson.loads(video_context_string)
+    except orjson.JSONDecodeError:
+        return video_context_string
+    if not isinstance(data, dict):
+        return video_context_string
+
+    filtered = {}
+    for key, value in data.items():
+        if isinstance(value, list):
+            value = [
+                entry for entry in value
+                if keywords & set(_WORD_RE.findall(orjson.dumps(entry).decode().lower()))
+            ]
+        filtered[key] = value
+    return orjson.dumps(filtered).decode()
+
+
+def _format_prefix(video_context_string: str) -> str:
+    """Wraps a context string in the fixed prompt instructions."""
+    return f"""
+    Answer the user's question using ONLY the provided JSON video context.
+    If the answer isn't in the context, state "I don't have information on that."
+    **CRITICAL:** Cite the exact MM:SS timestamp from the JSON for any event or dialogue mentioned.
+
+    --- Context (JSON) ---
+    {video_context_string}
+    --- End of Context ---
+"""
+
+
+def _ctx_path(filename: str) -> str:
+    """Path of the pre-baked prompt prefix that sits next to a JSON file."""
+    return os.path.join(JSON_DATA_DIR, filename + '.ctx.txt')
+
+
+def _bake_context(video_file: str, mtime_ns: int) -> str:
+    """
+    Builds the prompt prefix (instructions + context) from the JSON source
+    and writes it to the .ctx.txt sidecar so later loads -- including ones in
+    other worker processes -- are a single read with zero parsing.
+    """
+    prefix = _format_prefix(_load_cached(video_file, mtime_ns))
+    try:
+        with open(_ctx_path(video_file), 'w', encoding='utf-8') as f:
+            f.write(prefix)
+    except OSError as e:
+        # Baking is an optimization; serving must not depend on it.
+        print(f"Warning: could not write baked context for '{video_file}': {e}", file=sys.stderr)
+    return prefix
+
+
+def _prebake_contexts():
+    """
+    One-time pass at startup: bake a .ctx.txt for every JSON file that has
+    none yet or has changed since it was last baked. Request-time loads then
+    never touch a JSON parser.
+    """
+    if not os.path.isdir(JSON_DATA_DIR):
+        return
+    for name in list_video_files():
+        try:
+            mtime_ns = os.stat(os.path.join(JSON_DATA_DIR, name)).st_mtime_ns
+            if os.stat(_ctx_path(name)).st_mtime_ns >= mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        try:
+            _bake_context(name, mtime_ns)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: could not prebake '{name}': {e}", file=sys.stderr)
+
+
+@functools.lru_cache(maxsize=128)
+def _prompt_prefix(video_file: str, mtime_ns: int) -> str:
+    """
+    Returns the fixed part of the prompt (instructions + context) for one
+    file version, preferring the pre-baked .ctx.txt sidecar. Cached so N
+    questions about the same video hit the disk at most once.
+    """
+    ctx_path = _ctx_path(video_file)
+    try:
+        if os.stat(ctx_path).st_mtime_ns >= mtime_ns:
+            with open(ctx_path, 'r', encoding='utf-8') as f:
+                return f.read()
+    except FileNotFoundError:
+        pass
+    return _bake_context(video_file, mtime_ns)
+
+
+def _build_prompt(question: str, video_file: str) -> str:
+    """Synchronous prompt build; see create_prompt.
+
+    Only the question is formatted on the hot path; the instruction and
+    context prefix comes from a per-file-version cache. Oversized contexts
+    are first narrowed to the question's keywords, which is per-question
+    work and therefore bypasses the prefix cache.
+    """
+    video_file, mtime_ns = _resolve_context(video_file)
+    # Gate on the loaded string, not the on-disk size: for .json.gz files
+    # the file size is the compressed size, which would let a large context
+    # slip past the cap. The load is LRU-cached, so this costs one read per
+    # file version.
+    video_context = _load_cached(video_file, mtime_ns)
+    if len(video_context) > MAX_CTX_BYTES:
+        prefix = _format_prefix(_shrink_context(video_context, question))
+    else:
+        prefix = _prompt_prefix(video_file, mtime_ns)
+    return prefix + f"""
+    Question: "{question}"
+    """
+
+
+async def create_prompt(question: str, video_file: str) -> str:
+    """Creates a concise prompt for the Gemini model.
+
+    Runs the build in a worker thread: on a cache miss, reading/validating
+    a big context file and the oversized-context filtering are hundreds of
+    milliseconds of CPU that would otherwise block the event loop and stall
+    every concurrent stream.
+    """
+    return await asyncio.to_thread(_build_prompt, question, video_file)
+
+# Coalesce streamed model chunks into events of roughly this size before
+# sending; keeps per-event overhead low without hurting perceived latency.
+STREAM_FLUSH_BYTES = 4096
+
+# ...but also flush whenever the buffered text ends a sentence, so short
+# answers (most chat answers never reach 4 KB) still stream incrementally
+# instead of arriving as one event after generation finishes.
+_SENTENCE_ENDS = ('.', '?', '!', '\n')
+
+# Directory listing cache for /videos: the set of analysis files rarely
+# changes, so a short TTL removes the readdir from the request path.
+VIDEOS_CACHE_TTL = 10  # seconds
+_videos_cache = {"t": 0.0, "v": []}
+
+
+def list_video_files() -> list:
+    """Returns the .json filenames in JSON_DATA_DIR, cached for a few seconds."""
+    now = time.monotonic()
+    if now - _videos_cache["t"] < VIDEOS_CACHE_TTL:
+        return _videos_cache["v"]
+    # os.scandir avoids the extra stat per entry that listdir+isfile would do.
+    with os.scandir(JSON_DATA_DIR) as it:
+        video_files = [e.name for e in it if e.is_file() and e.name.endswith(('.json', '.json.gz'))]
+    _videos_cache["t"] = now
+    _videos_cache["v"] = video_files
+    return video_files
+
+
+# Bound on in-flight Gemini calls across this worker. Without it, a burst of
+# traffic turns into a thundering herd of rate-limited calls that all fail
+# and retry at once; excess requests now queue on the semaphore instead.
+GEMINI_CONCURRENCY = 8
+GEMINI_SEM = asyncio.Semaphore(GEMINI_CONCURRENCY)
+
+
+async def _generate_with_backoff(prompt: str, stream: bool = False):
+    """
+    Calls the model, retrying rate-limit errors with exponential backoff.
+    Callers are expected to hold GEMINI_SEM for the duration of the
+    generation (including stream consumption).
+    """
+    delay = 1.0
+    while True:
+        try:
+            return await model.generate_content_async(prompt, stream=stream)
+        except google_exceptions.ResourceExhausted:
+            if delay > 8:
+                raise
+            await asyncio.sleep(delay)
+            delay *= 2
+
+
+async def server_loop(q: "asyncio.Queue"):
+    """
+    Single background owner of the Gemini model for non-streaming requests.
+    Handlers enqueue (prompt, response_queue) pairs and await the result, so
+    model access is serialized in one place -- which keeps rate-limit
+    behavior predictable and gives a single spot to add retries later.
+    """
+    while True:
+        prompt, response_q = await q.get()
+        try:
+            async with GEMINI_SEM:
+                out = await _generate_with_backoff(prompt)
+        except Exception as e:
+            # Hand the error back to the waiting handler instead of dying.
+            out = e
+        await response_q.put(out)
+
+
+async def _warm_model():
+    """
+    Issues a tiny throwaway generation so the gRPC channel and TLS session
+    are established before the first real request, instead of adding that
+    handshake latency to someone's time-to-first-token.
+    """
+    try:
+        await model.generate_content_async("ping", generation_config={"max_output_tokens": 1})
+        print("✅ Gemini channel warmed.")
+    except Exception as e:
+        # Warming is best-effort; the first real request will just pay the cost.
+        print(f"Warning: model warm-up failed: {e}", file=sys.stderr)
+
+
+@app.on_event("startup")
+async def start_model_queue():
+    # Runs once per worker under any ASGI server, so baked contexts are
+    # fresh before the first request arrives.
+    _prebake_contexts()
+    app.state.model_queue = asyncio.Queue()
+    app.state.model_task = asyncio.create_task(server_loop(app.state.model_queue))
+    asyncio.create_task(_warm_model())
+
+
+# --- 4. API Endpoints ---
+
+@app.get("/videos")
+async def list_videos(request: Request):
+    """
+    Scans the JSON directory and returns a list of available video analysis files.
+    """
+    if not os.path.isdir(JSON_DATA_DIR):
+        return ORJSONResponse({"error": f"Server configuration error: Directory '{JSON_DATA_DIR}' not found."}, status_code=500)
+
+    try:
+        return ORJSONResponse(list_video_files())
+    except Exception as e:
+        return ORJSONResponse({"error": f"An unexpected error occurred while listing videos: {e}"}, status_code=500)
+
+@app.post("/ask")
+async def ask_question(request: Request):
+    """
+    Standard non-streaming endpoint. Accepts a question and a video_file.
+    """
+    try:
+        data = orjson.loads(await request.body())
+    except Exception:
+        data = None
+    if not data:
+        return ORJSONResponse({"error": "Invalid request. Expecting JSON body."}, status_code=400)
+
+    question = data.get('question')
+    video_file = data.get('video_file')
+
+    if not all([question, video_file]):
+        return ORJSONResponse({"error": "Both 'question' and 'video_file' must be provided."}, status_code=400)
+
+    try:
+        prompt = await create_prompt(question, video_file)
+        # Enqueue the prompt for the model-owning background task and await
+        # the answer on a private response queue.
+        response_q = asyncio.Queue(maxsize=1)
+        await app.state.model_queue.put((prompt, response_q))
+        response = await response_q.get()
+        if isinstance(response, Exception):
+            raise response
+        return ORJSONResponse({"answer": response.text})
+    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+        return ORJSONResponse({"error": str(e)}, status_code=404) # 404 for file not found or invalid
+    except Exception as e:
+        print(f"ERROR in /ask: {e}", file=sys.stderr)
+        return ORJSONResponse({"error": f"An internal server error occurred: {e}"}, status_code=500)
+
+@app.post("/ask-streaming")
+async def ask_question_streaming(request: Request):
+    """
+    Streaming endpoint. Returns the response as a real-time stream.
+    Accepts a question and a video_file.
+    """
+    try:
+        data = orjson.loads(await request.body())
+    except Exception:
+        data = None
+    if not data:
+        return ORJSONResponse({"error": "Invalid request. Expecting JSON body."}, status_code=400)
+
+    question = data.get('question')
+    video_file = data.get('video_file')
+
+    if not all([question, video_file]):
+        # Cannot return JSON for a stream, but this error happens before the stream starts.
+        return ORJSONResponse({"error": "Both 'question' and 'video_file' must be provided."}, status_code=400)
+
+    try:
+        # Build the prompt before starting the stream to catch file errors early.
+        prompt = await create_prompt(question, video_file)
+    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+        return ORJSONResponse({"error": str(e)}, status_code=404)
+
+    async def stream_gemini_response():
+        """An async generator that yields Server-Sent Events from the Gemini stream.
+
+        Keeping this async (rather than a sync generator pushed to a
+        threadpool) is what lets one worker serve many concurrent streams:
+        the event loop is free while we await the next chunk.
+
+        Each event is framed as `data: <json>\\n\\n` so browsers can consume
+        the stream with EventSource and clients get well-defined token
+        boundaries instead of ad-hoc text splitting. Model chunks are
+        coalesced up to STREAM_FLUSH_BYTES per event: tiny chunks would
+        otherwise each pay the full serialize/frame/send cost, which can
+        dominate a long generation.
+        """
+        buf = []
+        size = 0
+        try:
+            # Hold a semaphore slot for the whole generation: the provider
+            # is doing work until the last chunk arrives.
+            async with GEMINI_SEM:
+                response_stream = await _generate_with_backoff(prompt, stream=True)
+                async for chunk in response_stream:
+                    if chunk.text: # Ensure there's text to send
+                        buf.append(chunk.text)
+                        size += len(chunk.text)
+                        if size >= STREAM_FLUSH_BYTES or chunk.text.rstrip(' ').endswith(_SENTENCE_ENDS):
+                            yield b"data: " + orjson.dumps({'token': ''.join(buf)}) + b"\n\n"
+                            buf.clear()
+                            size = 0
+        except Exception as e:
+            print(f"Error during streaming: {e}", file=sys.stderr)
+            if buf:
+                yield b"data: " + orjson.dumps({'token': ''.join(buf)}) + b"\n\n"
+                buf.clear()
+            yield b"data: " + orjson.dumps({'error': f'An error occurred during streaming: {e}'}) + b"\n\n"
+        # Flush whatever is left, then a terminal event so clients know the
+        # stream ended cleanly.
+        if buf:
+            yield b"data: " + orjson.dumps({'token': ''.join(buf)}) + b"\n\n"
+        yield b'data: {"done": true}\n\n'
+
+    # Return a StreamingResponse that forwards the generator's output.
+    # X-Accel-Buffering stops nginx from buffering the stream, which would
+    # otherwise collapse per-token latency into bursts.
+    return StreamingResponse(
+        stream_gemini_response(),
+        media_type='text/event-stream',
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Connection": "keep-alive",
+        },
+    )
+
+@app.get("/")
+async def read_root(request: Request):
+    """Root endpoint to confirm the API is running."""
+    return ORJSONResponse({"status": "Video Chat API is running. Use the /videos, /ask or /ask-streaming endpoints."})
+
+# This allows running the app directly with `python app.py` for development.
+# In production, run under gunicorn with uvicorn workers (see Procfile):
+#   gunicorn app:app -k uvicorn.workers.UvicornWorker --workers 4 --timeout 0 -b 0.0.0.0:5001
+# --timeout 0 keeps gunicorn from killing a worker mid-SSE-stream.
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5001)
@@ -0,0 +1,22 @@
+"""
+One-time helper: gzip the json/*.json analysis files in place.
+
+The files compress 5-10x, which shrinks disk usage and the bytes read at
+load time; app.py serves .json.gz transparently (a request for 'X.json'
+falls back to 'X.json.gz'), so clients don't need to change.
+"""
+import os
+import gzip
+import shutil
+
+JSON_DATA_DIR = "json"
+
+for name in sorted(os.listdir(JSON_DATA_DIR)):
+    if not name.endswith('.json'):
+        continue
+    src = os.path.join(JSON_DATA_DIR, name)
+    dst = src + '.gz'
+    with open(src, 'rb') as f_in, gzip.open(dst, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(src)
+    print(f"✅ {src} -> {dst}")
@@ -1,64 +1,122 @@
-import os
-import re
-import subprocess
-
-# ------------------------------------------------------------------
-# CONFIGURATION
-# ------------------------------------------------------------------
-VIDEOS_DATA = [
-    # Corresponds to Medical_Training_Day.json
-    {"title": "Medical Training Day", "src": "https://videodata3.s3.us-east-2.amazonaws.com/Medical+Content.mp4"},
-
-    # Corresponds to Bike_Footage.json
-    {"title": "Bike Footage", "src": "https://videodata3.s3.us-east-2.amazonaws.com/bike_footage.mp4"},
-
-    # Corresponds to Teardown.json
-    {"title": "Teardown", "src": "https://videodata3.s3.us-east-2.amazonaws.com/teardown.mp4"},
-
-    # Corresponds to Construction.json
-    {"title": "Construction", "src": "https://videodata3.s3.us-east-2.amazonaws.com/carpentary+floor.mp4"},
-
-    # Extra videos (no matching JSON in this example)
-    {"title": "Medical Content", "src": "https://videodata3.s3.us-east-2.amazonaws.com/Medical+Training+Day.mp4"},
-    {"title": "Building FPV",    "src": "https://videodata3.s3.us-east-2.amazonaws.com/clip_04_web.mp4"},
-    {"title": "Night Market",    "src": "https://videodata3.s3.us-east-2.amazonaws.com/night_market_cropped.mp4"},
-]
-
-THUMB_TIME = 1          # second
-QUALITY    = 2          # lower = better (1-31)
-
-output_folder = "media"
-os.makedirs(output_folder, exist_ok=True)
-
-html_thumbnail_paths = []
-
-print("Starting thumbnail generation (FFmpeg, compatible flags)…\n")
-
-for info in VIDEOS_DATA:
-    title = info["title"]
-    url   = info["src"]
-    safe  = re.sub(r'[^A-Za-z0-9]+', '_', title)
-    thumb = os.path.join(output_folder, f"{safe}.jpg")
-
-    cmd = [
-        "ffmpeg",
-        "-v", "error",         # suppress banner & warnings
-        "-ss", str(THUMB_TIME), # seek BEFORE opening input
-        "-i", url,              # the video URL
-        "-vframes", "1",        # exactly one frame
-        "-q:v", str(QUALITY),   # JPEG quality
-        "-y",                   # overwrite existing file
-        thumb
-    ]
-
-    try:
-        subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL)
-        html_thumbnail_paths.append(f'thumbnail: "{thumb}"')
-        print(f"✅ {title}")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ FFmpeg failed for '{title}': {e}")
-
-print("\n--- HTML Thumbnail Paths ---")
-for line in html_thumbnail_paths:
-    print(line)
-print("----------------------------\n")
\ No newline at end of file
+import os
+import string
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# ------------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------------
+VIDEOS_DATA = [
+    # Corresponds to Medical_Training_Day.json
+    {"title": "Medical Training Day", "src": "https://videodata3.s3.us-east-2.amazonaws.com/Medical+Content.mp4"},
+
+    # Corresponds to Bike_Footage.json
+    {"title": "Bike Footage", "src": "https://videodata3.s3.us-east-2.amazonaws.com/bike_footage.mp4"},
+
+    # Corresponds to Teardown.json
+    {"title": "Teardown", "src": "https://videodata3.s3.us-east-2.amazonaws.com/teardown.mp4"},
+
+    # Corresponds to Construction.json
+    {"title": "Construction", "src": "https://videodata3.s3.us-east-2.amazonaws.com/carpentary+floor.mp4"},
+
+    # Extra videos (no matching JSON in this example)
+    {"title": "Medical Content", "src": "https://videodata3.s3.us-east-2.amazonaws.com/Medical+Training+Day.mp4"},
+    {"title": "Building FPV",    "src": "https://videodata3.s3.us-east-2.amazonaws.com/clip_04_web.mp4"},
+    {"title": "Night Market",    "src": "https://videodata3.s3.us-east-2.amazonaws.com/night_market_cropped.mp4"},
+]
+
+THUMB_TIME = 1          # second
+QUALITY    = 2          # lower = better (1-31)
+MAX_WORKERS = 8         # each job is its own ffmpeg process, network-bound
+
+output_folder = "media"
+os.makedirs(output_folder, exist_ok=True)
+
+# Slugifier: map every non-alphanumeric character to '_' through a
+# translation table built once at import -- a single C-level pass per call,
+# with no regex engine and no per-call pattern lookup.
+_KEEP = set(string.ascii_letters + string.digits)
+_SLUG_TABLE = str.maketrans({c: '_' for c in map(chr, range(256)) if c not in _KEEP})
+
+
+def slugify(title):
+    """Returns a filesystem-safe slug: alphanumerics kept, runs of anything
+    else collapsed to a single underscore."""
+    return '_'.join(filter(None, title.translate(_SLUG_TABLE).split('_')))
+
+
+def make_thumb(info):
+    """Generates one thumbnail; returns (title, thumb_path, error_or_None, skipped)."""
+    title = info["title"]
+    url   = info["src"]
+    safe  = slugify(title)
+    thumb = os.path.join(output_folder, f"{safe}.jpg")
+    etag_path = thumb + ".etag"
+
+    # Idempotency guard: if the thumbnail exists and the S3 object hasn't
+    # changed (same ETag as last run), a repeat run costs one HEAD request
+    # instead of a full ffmpeg fetch.
+    etag = None
+    try:
+        etag = requests.head(url, timeout=10).headers.get("ETag")
+    except requests.RequestException:
+        pass  # no ETag available; fall through and regenerate
+    if etag and os.path.exists(thumb) and os.path.exists(etag_path):
+        with open(etag_path) as f:
+            if f.read() == etag:
+                return (title, thumb, None, True)
+
+    cmd = [
+        "ffmpeg",
+        "-v", "error",          # suppress banner & warnings
+        "-ss", str(THUMB_TIME), # seek BEFORE opening input
+        "-fflags", "+fastseek", # favor seek speed over frame accuracy
+        # Let ffmpeg issue HTTP Range requests into the mp4 instead of
+        # downloading the whole object to reach the seek point
+        "-seekable", "1",
+        "-multiple_requests", "1",
+        # Retry dropped HTTP connections instead of failing the whole job
+        "-reconnect", "1",
+        "-reconnect_streamed", "1",
+        "-reconnect_delay_max", "5",
+        "-rw_timeout", "15000000",  # microseconds; don't hang on a dead socket
+        "-i", url,              # the video URL
+        "-an", "-sn", "-dn",    # no audio/subtitle/data demux work
+        "-frames:v", "1",       # exactly one frame
+        "-q:v", str(QUALITY),   # JPEG quality
+        "-y",                   # overwrite existing file
+        thumb
+    ]
+
+    try:
+        subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL)
+        if etag:
+            with open(etag_path, "w") as f:
+                f.write(etag)
+        return (title, thumb, None, False)
+    except subprocess.CalledProcessError as e:
+        return (title, thumb, e, False)
+
+
+if __name__ == "__main__":
+    print("Starting thumbnail generation (FFmpeg, compatible flags)…\n")
+
+    # The jobs are dominated by network seeks into S3, so running them
+    # concurrently gives near-linear speedup up to available bandwidth.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        results = list(ex.map(make_thumb, VIDEOS_DATA))
+
+    html_thumbnail_paths = []
+    for title, thumb, error, skipped in results:
+        if error is None:
+            html_thumbnail_paths.append(f'thumbnail: "{thumb}"')
+            print(f"✅ {title}" + (" (up to date, skipped)" if skipped else ""))
+        else:
+            print(f"❌ FFmpeg failed for '{title}': {error}")
+
+    print("\n--- HTML Thumbnail Paths ---")
+    for line in html_thumbnail_paths:
+        print(line)
+    print("----------------------------\n")